@@ -2,6 +2,13 @@
 Memov MCP Server - AI-assisted version control with automatic prompt recording
 """
 
-from .cli.server_cli import ServerCLI
-
 __all__ = ["ServerCLI"]
+
+
+def __getattr__(name: str):
+    # Resolve exports lazily so importing the package stays cheap
+    if name == "ServerCLI":
+        from .cli.server_cli import ServerCLI
+
+        return ServerCLI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,6 +2,13 @@
 CLI package for managing Mem MCP servers
 """
 
-from .server_cli import ServerCLI
-
 __all__ = ["ServerCLI"]
+
+
+def __getattr__(name: str):
+    # Resolve exports lazily so importing the package stays cheap
+    if name == "ServerCLI":
+        from .server_cli import ServerCLI
+
+        return ServerCLI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,142 +2,298 @@
 Mov CLI - Command line interface for managing Memov MCP servers
 """
 
+import argparse
 import datetime
 import json
+import os
+import signal
 import socket
 import subprocess
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Annotated, Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-import psutil
-import typer
+from mem_mcp_server.globals import CONFIG_DIR, SNAP_DRAIN_TIMEOUT
+from mem_mcp_server.utils.json_utils import json_dumps, json_loads
 
-from mem_mcp_server.globals import CONFIG_DIR
+if TYPE_CHECKING:
+    import psutil
+
+BYTES_TO_MB = 1 / (1024 * 1024)
+# Command prefix used to spawn a background HTTP server
+LAUNCHER_NAME = "mem-mcp-launcher"
+LAUNCHER_ARGV = ("uv", "run", LAUNCHER_NAME, "http")
 
 
 class ServerCLI:
     """CLI manager for Mem MCP servers"""
 
+    # Number of superseded records tolerated in the PID file before it is rewritten
+    COMPACT_THRESHOLD = 100
+    # Max seconds between a server's process creation and its recorded start_timestamp
+    START_TIME_TOLERANCE = 10.0
+    # Seconds a stopping server gets before it is killed; it needs time to drain its snap queue
+    STOP_TIMEOUT = SNAP_DRAIN_TIMEOUT + 10.0
+
     def __init__(self):
         self.config_dir = CONFIG_DIR
-        self.pid_file = self.config_dir / "servers.json"
+        self.pid_file = self.config_dir / "servers.jsonl"
+        # PID file written by older versions as a single JSON object, migrated on first load
+        self.legacy_pid_file = self.config_dir / "servers.json"
         self.config_dir.mkdir(exist_ok=True)
 
+        # In-memory copy of the PID file. Each change is appended as one JSON line
+        # ({"key": ..., "info": ...}, or {"key": ..., "deleted": true} when removed)
+        self._servers_cache: Optional[dict] = None
+        self._pending: dict[str, Optional[dict]] = {}
+        self._record_count = 0
+        self._rewrite = False
+        # psutil.Process handles reused across status() calls
+        self._proc_cache: dict[int, "psutil.Process"] = {}
+        # Guards the servers cache while servers are stopped in parallel
+        self._lock = threading.Lock()
+
     def load_servers(self) -> dict:
-        """Load running servers from PID file"""
-        if not self.pid_file.exists():
-            return {}
+        """Load running servers from PID file (read once, then served from cache)"""
+        if self._servers_cache is not None:
+            return self._servers_cache
+
+        if not self.pid_file.exists() and self.legacy_pid_file.exists():
+            return self.migrate_legacy_servers()
+
+        servers = {}
+        record_count = 0
+        if self.pid_file.exists():
+            try:
+                with open(self.pid_file, "rb") as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            # A torn trailing line; appending after it would corrupt the next
+                            # record, so have the next save rewrite the file instead
+                            self._rewrite = True
+                        try:
+                            record = json_loads(line)
+                        except json.JSONDecodeError:
+                            self._rewrite = True
+                            continue
+                        if not isinstance(record, dict) or "key" not in record:
+                            self._rewrite = True
+                            continue
+                        record_count += 1
+                        if record.get("deleted"):
+                            servers.pop(record["key"], None)
+                        elif "info" in record:
+                            servers[record["key"]] = record["info"]
+                        else:
+                            self._rewrite = True
+            except IOError:
+                servers = {}
+
+        self._servers_cache = servers
+        self._record_count = record_count
+        return servers
 
+    def migrate_legacy_servers(self) -> dict:
+        """Import servers from the legacy servers.json into the PID file, then remove it"""
         try:
-            with open(self.pid_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
+            with open(self.legacy_pid_file, "rb") as f:
+                servers = json_loads(f.read())
+        except (IOError, json.JSONDecodeError):
+            servers = {}
+        if not isinstance(servers, dict):
+            servers = {}
+
+        self.save_servers(servers)
+        self.legacy_pid_file.unlink(missing_ok=True)
+        return servers
 
-    def save_servers(self, servers: dict) -> None:
-        """Save running servers to PID file"""
-        with open(self.pid_file, "w") as f:
-            json.dump(servers, f, indent=2)
+    def set_server(self, server_key: str, server_info: dict) -> None:
+        """Add or update a server in the cache, persisted by the next save_servers()"""
+        self.load_servers()[server_key] = server_info
+        self._pending[server_key] = server_info
+
+    def remove_server(self, server_key: str) -> None:
+        """Remove a server from the cache, persisted by the next save_servers()"""
+        if self.load_servers().pop(server_key, None) is not None:
+            self._pending[server_key] = None
+
+    def save_servers(self, servers: Optional[dict] = None) -> None:
+        """Save pending server changes to the PID file
+
+        Changes are appended one line per server. Passing ``servers`` replaces the
+        whole set, and the file is rewritten once too many stale records pile up.
+        """
+        if servers is not None:
+            self._servers_cache = servers
+            self._rewrite = True
+
+        if self._servers_cache is None:
+            return
+
+        if self._record_count + len(self._pending) > (
+            len(self._servers_cache) + self.COMPACT_THRESHOLD
+        ):
+            self._rewrite = True
+
+        if self._rewrite:
+            # Write to a temp file and swap it in, so readers never see a partial file
+            tmp_file = self.pid_file.with_suffix(".tmp")
+            with open(tmp_file, "wb") as f:
+                for server_key, server_info in self._servers_cache.items():
+                    f.write(json_dumps({"key": server_key, "info": server_info}) + b"\n")
+            os.replace(tmp_file, self.pid_file)
+            self._record_count = len(self._servers_cache)
+        elif self._pending:
+            with open(self.pid_file, "ab") as f:
+                for server_key, server_info in self._pending.items():
+                    if server_info is None:
+                        record = {"key": server_key, "deleted": True}
+                    else:
+                        record = {"key": server_key, "info": server_info}
+                    f.write(json_dumps(record) + b"\n")
+            self._record_count += len(self._pending)
+
+        self._pending.clear()
+        self._rewrite = False
 
     def start_server(self, workspace: str, port: int = 8000, host: str = "127.0.0.1") -> bool:
         """Start a new MCP server in background"""
         workspace_path = Path(workspace).resolve()
 
         if not workspace_path.exists():
-            typer.echo(f"❌ Error: Workspace path '{workspace}' does not exist", err=True)
+            print(f"❌ Error: Workspace path '{workspace}' does not exist", file=sys.stderr)
             return False
 
         if not workspace_path.is_dir():
-            typer.echo(f"❌ Error: Workspace path '{workspace}' is not a directory", err=True)
+            print(f"❌ Error: Workspace path '{workspace}' is not a directory", file=sys.stderr)
             return False
 
         # Check if port is already in use
         if self.is_port_in_use(host, port):
-            typer.echo(f"❌ Error: IP {host}:{port} is already in use", err=True)
+            print(f"❌ Error: IP {host}:{port} is already in use", file=sys.stderr)
             return False
 
-        # Check if server is already running
-        alive_servers = self.status(verbose=False)
-        if str(workspace_path) in alive_servers:
-            typer.echo(
-                f"⚠️  Server already running on ip {host}:{port} for workspace {workspace}",
-                err=True,
-            )
-            return False
+        # Check if server is already running for this workspace
+        server_key = str(workspace_path)
+        existing_server = self.load_servers().get(server_key)
+        if existing_server is not None:
+            if self.get_process(existing_server["pid"]) is not None:
+                print(
+                    f"⚠️  Server already running on ip {host}:{port} for workspace {workspace}",
+                    file=sys.stderr,
+                )
+                return False
+            # Stale entry left by a server that died, it is replaced below
+            self.remove_server(server_key)
 
         # Start server in background
         try:
+            # Run the server in its own process group so it can be stopped with one signal
+            if os.name == "nt":
+                group_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+            else:
+                group_kwargs = {"start_new_session": True}
+
+            # Send the server's console output to a log file rather than pipes nobody drains
+            output_path = self.config_dir / "logs" / f"server_{time.strftime('%Y%m%d_%H%M%S')}.out"
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+
             # Start the server process using uvx
-            process = subprocess.Popen(
-                [
-                    "uv",
-                    "run",
-                    "mem-mcp-launcher",
-                    "http",
-                    str(workspace_path),
-                    "--port",
-                    str(port),
-                    "--host",
-                    host,
-                    "--port",
-                    str(port),
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
+            with open(output_path, "ab") as output_file:
+                process = subprocess.Popen(
+                    [*LAUNCHER_ARGV, str(workspace_path), "--host", host, "--port", str(port)],
+                    stdout=output_file,
+                    stderr=subprocess.STDOUT,
+                    **group_kwargs,
+                )
 
-            # Wait a moment to see if it starts successfully
-            time.sleep(2)
+            # Wait until the server answers its health check, exits, or the wait times out
+            self.wait_for_server(process, host, port)
 
             if process.poll() is None:  # Process is still running
                 # Save server info
-                alive_servers[str(workspace_path)] = {
-                    "pid": process.pid,
-                    "workspace": str(workspace_path),
-                    "port": port,
-                    "host": host,
-                    "start_timestamp": datetime.datetime.now().timestamp(),
-                    "start_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "status": "running",
-                }
-                self.save_servers(alive_servers)
-
-                typer.echo(f"✅ Started Mov server")
-                typer.echo(f"   📁 Workspace: {workspace_path}")
-                typer.echo(f"   🌐 URL: http://{host}:{port}/mcp")
-                typer.echo(f"   🏥 Health: http://{host}:{port}/health")
-                typer.echo(f"   🆔 PID: {process.pid}")
+                self.set_server(
+                    server_key,
+                    {
+                        "pid": process.pid,
+                        "workspace": str(workspace_path),
+                        "port": port,
+                        "host": host,
+                        "start_timestamp": datetime.datetime.now().timestamp(),
+                        "start_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "status": "running",
+                    },
+                )
+                self.save_servers()
+
+                print(f"✅ Started Mov server")
+                print(f"   📁 Workspace: {workspace_path}")
+                print(f"   🌐 URL: http://{host}:{port}/mcp")
+                print(f"   🏥 Health: http://{host}:{port}/health")
+                print(f"   🆔 PID: {process.pid}")
                 return True
             else:
                 # Process failed to start
-                stdout, stderr = process.communicate()
-                typer.echo(f"❌ Failed to start server:")
-                typer.echo(f"   Output: {stdout}")
-                typer.echo(f"   Error: {stderr}")
+                print(f"❌ Failed to start server:")
+                print(f"   Output: {self.read_log_tail(output_path)}")
+                print(f"   Log: {output_path}")
                 return False
 
         except Exception as e:
-            typer.echo(f"❌ Error starting server: {e}")
+            print(f"❌ Error starting server: {e}")
             return False
 
+    def read_log_tail(self, log_path: Path, max_bytes: int = 4096) -> str:
+        """Read the last max_bytes of a log file"""
+        try:
+            with open(log_path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - max_bytes))
+                return f.read().decode("utf-8", errors="replace")
+        except OSError:
+            return ""
+
+    def wait_for_server(
+        self, process: subprocess.Popen, host: str, port: int, timeout: float = 2.0
+    ) -> bool:
+        """Poll the server's health endpoint until it is ready, return False if it never was"""
+        # Imported here so status/stop don't pay for it; unlike urllib it never uses a proxy
+        import http.client
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:  # Process exited before it became ready
+                return False
+            connection = http.client.HTTPConnection(host, port, timeout=0.05)
+            try:
+                connection.request("GET", "/health")
+                if connection.getresponse().status == 200:
+                    return True
+            except (http.client.HTTPException, OSError):
+                pass
+            finally:
+                connection.close()
+            time.sleep(0.1)
+        return False
+
     def stop_server(
         self, workspace: Optional[str] = None, port: Optional[int] = None, all_servers: bool = False
     ):
         """Stop running server(s)"""
         servers = self.load_servers()
+        # Servers are keyed by their resolved workspace path, so resolve it only once
+        workspace_str = str(Path(workspace).resolve()) if workspace else None
 
         if all_servers:
             # Stop all servers
             if not servers:
-                typer.echo("ℹ️  No servers running")
+                print("ℹ️  No servers running")
                 return
 
-            stopped_count = 0
-            for server_key, server_info in servers.items():
-                if self.stop_single_server(server_key, server_info):
-                    stopped_count += 1
+            stopped_count = self.stop_servers(list(servers.items()))
 
             if stopped_count > 0:
                 print(f"✅ Stopped {stopped_count} server(s)")
@@ -147,10 +303,11 @@ class ServerCLI:
 
         # Stop specific server
         if workspace and port:
-            workspace_path = Path(workspace).resolve()
-            server_key = self.get_server_key(str(workspace_path), port)
-            if server_key in servers:
-                if self.stop_single_server(server_key, servers[server_key]):
+            server_info = servers.get(workspace_str)
+            if server_info is not None and server_info["port"] == port:
+                stopped = self.stop_single_server(workspace_str, server_info)
+                self.save_servers()
+                if stopped:
                     print(f"✅ Stopped server for workspace {workspace} on port {port}")
                 else:
                     print(f"ℹ️  Server for workspace {workspace} on port {port} was not running")
@@ -159,13 +316,10 @@ class ServerCLI:
             return
         elif workspace:
             # Stop all servers for this workspace
-            workspace_path = Path(workspace).resolve()
-            workspace_str = str(workspace_path)
-            stopped_count = 0
-            for server_key, server_info in list(servers.items()):
-                if server_info["workspace"] == workspace_str:
-                    if self.stop_single_server(server_key, server_info):
-                        stopped_count += 1
+            server_info = servers.get(workspace_str)
+            stopped_count = self.stop_servers(
+                [(workspace_str, server_info)] if server_info is not None else []
+            )
 
             if stopped_count > 0:
                 print(f"✅ Stopped {stopped_count} server(s) for workspace {workspace}")
@@ -174,11 +328,9 @@ class ServerCLI:
             return
         elif port:
             # Stop all servers on this port
-            stopped_count = 0
-            for server_key, server_info in list(servers.items()):
-                if server_info["port"] == port:
-                    if self.stop_single_server(server_key, server_info):
-                        stopped_count += 1
+            stopped_count = self.stop_servers(
+                [item for item in servers.items() if item[1]["port"] == port]
+            )
 
             if stopped_count > 0:
                 print(f"✅ Stopped {stopped_count} server(s) on port {port}")
@@ -189,35 +341,68 @@ class ServerCLI:
             print("❌ Error: Must specify workspace, port, or use --all")
             return
 
+    def stop_servers(self, targets: list[tuple[str, dict]]) -> int:
+        """Stop the given servers concurrently and return how many were stopped"""
+        if not targets:
+            return 0
+
+        stopped_count = 0
+        # Stopping is dominated by waiting for processes to exit, so threads overlap well
+        with ThreadPoolExecutor(max_workers=min(32, len(targets))) as executor:
+            futures = [
+                executor.submit(self.stop_single_server, server_key, server_info)
+                for server_key, server_info in targets
+            ]
+            for future in as_completed(futures):
+                if future.result():
+                    stopped_count += 1
+
+        self.save_servers()
+        return stopped_count
+
     def stop_single_server(self, server_key: str, server_info: dict) -> bool:
         """Stop a single server"""
 
         def del_server_key():
-            """Delete server key from config"""
-            servers = self.load_servers()
-            if server_key in servers:
-                del servers[server_key]
-                self.save_servers(servers)
+            """Delete server key from config, the caller is responsible for saving"""
+            with self._lock:
+                self.remove_server(server_key)
+
+        import psutil
 
         pid = server_info["pid"]
 
         try:
             process = psutil.Process(pid)
-            children = process.children(recursive=True)
-            for child in children:
-                child.terminate()
-            process.terminate()
+            if not self.is_server_process(process, server_info):
+                # The pid was reused by an unrelated process after our server died
+                del_server_key()
+                return False
 
-            # process.wait(timeout=5)
-            gone, alive = psutil.wait_procs([process] + children, timeout=5)
+            if os.name == "posix" and os.getpgid(pid) == pid:
+                # The server leads its own process group, signal the whole tree at once
+                os.killpg(pid, signal.SIGTERM)
+                try:
+                    process.wait(timeout=self.STOP_TIMEOUT)
+                except psutil.TimeoutExpired:
+                    os.killpg(pid, signal.SIGKILL)
+            else:
+                # Fall back to walking the process tree (Windows, or servers started
+                # before process groups were used)
+                children = process.children(recursive=True)
+                for child in children:
+                    child.terminate()
+                process.terminate()
 
-            for p in alive:
-                p.kill()
+                gone, alive = psutil.wait_procs([process] + children, timeout=self.STOP_TIMEOUT)
+
+                for p in alive:
+                    p.kill()
 
             # Remove from config
             del_server_key()
             return True
-        except psutil.NoSuchProcess:
+        except (psutil.NoSuchProcess, ProcessLookupError):
             # Process already dead
             del_server_key()
             return False
@@ -225,18 +410,35 @@ class ServerCLI:
             print(f"❌ Error stopping server {pid}: {e}")
             return False
 
+    def is_server_process(self, process: "psutil.Process", server_info: dict) -> bool:
+        """Check that process is the server recorded in server_info, not a reused pid"""
+        import psutil
+
+        try:
+            start_gap = abs(process.create_time() - server_info["start_timestamp"])
+            if start_gap <= self.START_TIME_TOLERANCE:
+                return True
+            return any(LAUNCHER_NAME in arg for arg in process.cmdline())
+        except psutil.Error:
+            return False
+
     def status(self, verbose: bool = True) -> dict[str, dict[str, Any]]:
         """Show status of all servers"""
+        import psutil
+
         servers = self.load_servers()
 
         if not servers:
             if verbose:
-                typer.echo("ℹ️  No servers running")
+                print("ℹ️  No servers running")
             return servers
 
         if verbose:
-            typer.echo("🔄 Mov Server Status:")
-            typer.echo("-" * 80)
+            print("🔄 Mov Server Status:")
+            print("-" * 80)
+
+        # One /proc scan up front instead of a liveness syscall per server
+        live_pids = frozenset(psutil.pids())
 
         running_count = 0
         server_to_delete = []
@@ -248,94 +450,147 @@ class ServerCLI:
             start_timestamp = server_info["start_timestamp"]
             start_time = server_info["start_time"]
 
-            if psutil.pid_exists(pid):
-                process = psutil.Process(pid)
+            process = None
+            if pid in live_pids:
+                process = self.get_process(pid)
+            else:
+                self._proc_cache.pop(pid, None)
+
+            if process is not None:
                 uptime = time.time() - start_timestamp
                 uptime_str = datetime.timedelta(seconds=int(uptime))
                 running_count += 1
 
                 if verbose:
-                    typer.echo(f"✅ Running (PID: {pid})")
-                    typer.echo(f"   📁 Workspace: {workspace}")
-                    typer.echo(f"   🌐 URL: http://{host}:{port}/mcp")
-                    typer.echo(f"   ⏱️ Start time: {start_time}")
-                    typer.echo(f"   ⏱️ Uptime: {uptime_str}")
-                    typer.echo(f"   💾 Memory: {process.memory_info().rss / 1024 / 1024:.1f} MB")
-                    typer.echo()
+                    print(f"✅ Running (PID: {pid})")
+                    print(f"   📁 Workspace: {workspace}")
+                    print(f"   🌐 URL: http://{host}:{port}/mcp")
+                    print(f"   ⏱️ Start time: {start_time}")
+                    print(f"   ⏱️ Uptime: {uptime_str}")
+                    try:
+                        # oneshot() lets any further process getters share a single /proc read
+                        with process.oneshot():
+                            rss_mb = process.memory_info().rss * BYTES_TO_MB
+                        print(f"   💾 Memory: {rss_mb:.1f} MB")
+                    except psutil.NoSuchProcess:
+                        self._proc_cache.pop(pid, None)
+                    print()
             else:
                 if verbose:
-                    typer.echo(f"❌ Dead (PID: {pid})")
-                    typer.echo(f"   📁 Workspace: {workspace}")
-                    typer.echo(f"   🌐 Port: {port}")
-                    typer.echo()
+                    print(f"❌ Dead (PID: {pid})")
+                    print(f"   📁 Workspace: {workspace}")
+                    print(f"   🌐 Port: {port}")
+                    print()
                 server_to_delete.append(server_key)  # Mark for deletion
 
         if verbose:
-            typer.echo(f"📊 Summary: {running_count}/{len(servers)} servers running")
+            print(f"📊 Summary: {running_count}/{len(servers)} servers running")
 
         # Clean up dead servers and their config
         for server_key in server_to_delete:
-            del servers[server_key]
-        self.save_servers(servers)
+            self.remove_server(server_key)
+        self.save_servers()
 
         return servers
 
+    def get_process(self, pid: int) -> Optional["psutil.Process"]:
+        """Get a cached process handle for pid, or None if the process is gone"""
+        import psutil
+
+        process = self._proc_cache.get(pid)
+        if process is None:
+            try:
+                process = psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                return None
+            self._proc_cache[pid] = process
+
+        # is_running() also guards against the pid being reused by another process
+        if not process.is_running():
+            self._proc_cache.pop(pid, None)
+            return None
+        return process
+
     def is_port_in_use(self, host: str, port: int) -> bool:
         """Check if port is already in use"""
-        # TODO: change to check http://ip:port/health
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(1)
-            return s.connect_ex((host, port)) == 0
+        try:
+            # Phase 1: the port is free only if we can actually bind and listen on it
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                s.bind((host, port))
+                s.listen(1)
+
+            # Phase 2: make sure no lingering listener still accepts connections
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.settimeout(0.05)
+                return s.connect_ex((host, port)) == 0
+        except (OSError, OverflowError):
+            return True
 
 
-app = typer.Typer(
-    help="Mem MCP Server Manager - Manage MCP servers for workspace monitoring",
-    rich_markup_mode="rich",
-)
 cli = ServerCLI()
 
 
-@app.command(help="Start a new MCP server")
-def start(
-    workspace: Annotated[str, typer.Option(help="Workspace directory to monitor")],
-    port: Annotated[int, typer.Option(help="Port to run server on")] = 8000,
-    host: Annotated[str, typer.Option(help="Host to bind to")] = "127.0.0.1",
-):
+def start(workspace: str, port: int = 8000, host: str = "127.0.0.1"):
     """Start a new server"""
     cli.start_server(workspace, port, host)
 
 
-@app.command(help="Stop running server(s)")
-def stop(
-    workspace: Annotated[Optional[str], typer.Option(help="Workspace directory")] = None,
-    port: Annotated[Optional[int], typer.Option(help="Port number")] = None,
-    all_servers: Annotated[bool, typer.Option("--all", help="Stop all running servers")] = False,
-):
+def stop(workspace: Optional[str] = None, port: Optional[int] = None, all_servers: bool = False):
     """Stop server(s)"""
 
     # Must specify at least one option
     if not workspace and not port and not all_servers:
-        typer.echo(
-            "❌ Error: Must specify at least one option: --workspace, --port, or --all", err=True
+        print(
+            "❌ Error: Must specify at least one option: --workspace, --port, or --all",
+            file=sys.stderr,
         )
-        raise typer.Exit(1)
+        sys.exit(1)
 
     # If --all is specified, ignore other options
     if all_servers and (workspace or port):
-        typer.echo("⚠️  Warning: --all flag specified, ignoring other options")
+        print("⚠️  Warning: --all flag specified, ignoring other options")
 
     cli.stop_server(workspace, port, all_servers)
 
 
-@app.command(help="Show status of all running servers")
 def status():
     """Show server status"""
     cli.status()
 
 
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the start/stop/status commands"""
+    parser = argparse.ArgumentParser(
+        description="Mem MCP Server Manager - Manage MCP servers for workspace monitoring"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    start_parser = subparsers.add_parser("start", help="Start a new MCP server")
+    start_parser.add_argument("--workspace", required=True, help="Workspace directory to monitor")
+    start_parser.add_argument("--port", type=int, default=8000, help="Port to run server on")
+    start_parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+
+    stop_parser = subparsers.add_parser("stop", help="Stop running server(s)")
+    stop_parser.add_argument("--workspace", help="Workspace directory")
+    stop_parser.add_argument("--port", type=int, help="Port number")
+    stop_parser.add_argument(
+        "--all", dest="all_servers", action="store_true", help="Stop all running servers"
+    )
+
+    subparsers.add_parser("status", help="Show status of all running servers")
+    return parser
+
+
 def main() -> None:
-    """Main CLI entry point using Typer"""
-    app()
+    """Main CLI entry point using argparse"""
+    args = build_parser().parse_args()
+    if args.command == "start":
+        start(args.workspace, args.port, args.host)
+    elif args.command == "stop":
+        stop(args.workspace, args.port, args.all_servers)
+    elif args.command == "status":
+        status()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,6 @@
 from pathlib import Path
 
 CONFIG_DIR = Path.home() / ".mem_mcp_server"
+
+# How long a stopping MCP server waits for queued snap jobs to be recorded
+SNAP_DRAIN_TIMEOUT = 20.0
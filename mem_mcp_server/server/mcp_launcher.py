@@ -15,7 +15,7 @@ from mem_mcp_server.server.mcp_server import MemMCPTools
 
 # Set up logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 LOGGER = logging.getLogger(__name__)
@@ -73,6 +73,8 @@ def mcp_launcher(
         LOGGER.info(f"")
 
         mem_mcp_tools = MemMCPTools(project_path)
+        MemMCPTools.mcp.settings.host = host
+        MemMCPTools.mcp.settings.port = port
         mem_mcp_tools.run(transport="streamable-http")
 
 
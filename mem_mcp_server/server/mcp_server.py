@@ -10,53 +10,227 @@ Author: Memov Team
 License: MIT
 """
 
+import asyncio
+import itertools
 import logging
 import os
+import re
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
 from mcp.server.fastmcp import FastMCP
 from starlette.requests import Request
 from starlette.responses import PlainTextResponse
 
-from memov.core.manager import MemovManager, MemStatus
+from mem_mcp_server.globals import SNAP_DRAIN_TIMEOUT
+from mem_mcp_server.utils.json_utils import json_dumps
+
+if TYPE_CHECKING:
+    from memov.core.manager import MemovManager
 
 LOGGER = logging.getLogger(__name__)
 
+# The default Proactor loop on Windows keeps idle servers polling IOCP; the selector loop sleeps.
+# This must be set before FastMCP starts its event loop.
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+# The health check body never changes, so a single response instance is reused
+HEALTH_RESPONSE = PlainTextResponse("OK")
+
+# Framing of the agent plan and response recorded with each snapshot
+AGENT_PLAN_PREFIX = '[Agent Plan]:\n"planning_strategy": '
+AGENT_RESPONSE_PREFIX = "\n\n[Agent Response]:\n"
+
+# Separator between entries of the comma-separated files_changed argument
+FILES_SPLIT_RE = re.compile(r"\s*,\s*")
+
+# Upper bound on snap jobs waiting to be recorded; further jobs are dropped with a warning
+SNAP_QUEUE_MAXSIZE = 20000
+# Jobs queued within the linger window are recorded together, up to MAX_SNAP_BATCH at a time
+MAX_SNAP_BATCH = 50
+SNAP_BATCH_LINGER = 0.01
+
+
+@dataclass(frozen=True, slots=True)
+class SnapJob:
+    """A snap() call waiting to be recorded by the background worker"""
+
+    project_path: str
+    project_root: Path
+    user_prompt: str
+    original_response: str
+    agent_plan: list[str]
+    files_changed: str
+
+    @classmethod
+    def merge(cls, jobs: list["SnapJob"]) -> "SnapJob":
+        """Combine jobs for the same project into one job that is recorded as a single commit"""
+        if len(jobs) == 1:
+            return jobs[0]
+        return cls(
+            project_path=jobs[0].project_path,
+            project_root=jobs[0].project_root,
+            user_prompt="\n\n".join(job.user_prompt for job in jobs),
+            original_response="\n\n".join(job.original_response for job in jobs),
+            agent_plan=[plan_step for job in jobs for plan_step in job.agent_plan],
+            files_changed=",".join(job.files_changed for job in jobs if job.files_changed.strip()),
+        )
+
+
+def build_full_response(agent_plan: list[str], original_response: str) -> str:
+    """Frame the agent plan (if any) and the original response as recorded with a snapshot"""
+    if not agent_plan:
+        return AGENT_RESPONSE_PREFIX.lstrip("\n") + original_response
+    agent_plan_json = json_dumps(
+        {f"plan{i}": plan_step for i, plan_step in enumerate(agent_plan, 1)}
+    ).decode("utf-8")
+    return "".join((AGENT_PLAN_PREFIX, agent_plan_json, AGENT_RESPONSE_PREFIX, original_response))
+
 
 class MemMCPTools:
     # Initialize FastMCP server
     mcp = FastMCP("Memov MCP Server")
 
-    # Global context storage for user prompts and working directory
+    # Global storage for the working directory
     _project_path = None
-    _user_context = {
-        "current_prompt": None,
-        "current_response": None,
-        "timestamp": None,
-        "session_id": None,
-        # Indicates if the context has been cleaned, it should be reset after each interaction with the agent
-        "context_cleaned": True,
-    }
+    # Resolved form of the project path, computed once instead of on every snap
+    _project_root_path: Optional[Path] = None
+    # Projects whose memov repo is known to be initialized, so check()/init() run only once
+    _initialized_projects: set[str] = set()
+    # MemovManager instances reused across snap() calls, keyed by project path
+    _memov_managers: dict[str, "MemovManager"] = {}
+    # Pending snap jobs and the worker task recording them, created on the first snap() call
+    _snap_queue: Optional[asyncio.Queue] = None
+    _snap_worker_task: Optional[asyncio.Task] = None
+    # Jobs taken off the queue by a worker that stopped before recording them
+    _unrecorded_snap_jobs = 0
+    # memov writes to one repo cannot run in parallel, so they get a dedicated single thread
+    _memov_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memov")
 
     def __init__(self, project_path: str) -> None:
+        # Validated once here; snap() relies on _project_path only ever holding a directory
+        if not os.path.isdir(project_path):
+            raise ValueError(f"Project path '{project_path}' is not a directory.")
         MemMCPTools._project_path = project_path
+        MemMCPTools._project_root_path = Path(project_path).resolve()
 
-    def run(self, *args, **kwargs) -> None:
+    def run(self, transport: str = "stdio") -> None:
         """
         Run the MCP tools server.
         """
         LOGGER.info("Running MemMCPTools server...")
-        # Start the FastMCP server
-        MemMCPTools.mcp.run(*args, **kwargs)
+        runners = {
+            "stdio": MemMCPTools.mcp.run_stdio_async,
+            "sse": MemMCPTools.mcp.run_sse_async,
+            "streamable-http": MemMCPTools.mcp.run_streamable_http_async,
+        }
+        if transport not in runners:
+            raise ValueError(f"Unknown transport: {transport}")
+
+        async def serve() -> None:
+            try:
+                # Start the FastMCP server
+                await runners[transport]()
+            finally:
+                # snap() returns before the interaction is recorded, so finish queued jobs
+                await MemMCPTools._drain_snap_queue()
+
+        def exit_on_sigterm(signum, frame) -> None:
+            raise SystemExit(128 + signum)
+
+        # uvicorn re-raises SIGTERM once it has shut down; exiting through SystemExit instead of
+        # the default handler lets serve() drain the snap queue first
+        signal.signal(signal.SIGTERM, exit_on_sigterm)
+        asyncio.run(serve())
+
+    @staticmethod
+    def _get_manager(project_path: str) -> "MemovManager":
+        """Return the cached MemovManager for the project, creating it on first use"""
+        if (memov_manager := MemMCPTools._memov_managers.get(project_path)) is None:
+            from memov.core.manager import MemovManager
+
+            memov_manager = MemovManager(project_path=project_path)
+            MemMCPTools._memov_managers[project_path] = memov_manager
+        return memov_manager
+
+    @staticmethod
+    def _ensure_snap_worker() -> asyncio.Queue:
+        """Start the snap worker on the running event loop unless it is already alive"""
+        worker_task = MemMCPTools._snap_worker_task
+        if worker_task is None or worker_task.done():
+            queue = MemMCPTools._snap_queue
+            if worker_task is None or worker_task.get_loop() is not asyncio.get_running_loop():
+                # A queue is bound to the event loop that used it, so a new loop gets a new
+                # queue, carrying over any jobs left behind by the old one
+                queue = asyncio.Queue(maxsize=SNAP_QUEUE_MAXSIZE)
+                while MemMCPTools._snap_queue is not None and not MemMCPTools._snap_queue.empty():
+                    queue.put_nowait(MemMCPTools._snap_queue.get_nowait())
+            elif not worker_task.cancelled() and worker_task.exception() is not None:
+                LOGGER.error("Snap worker died, restarting it", exc_info=worker_task.exception())
+            MemMCPTools._snap_queue = queue
+            MemMCPTools._snap_worker_task = asyncio.create_task(MemMCPTools._snap_worker(queue))
+        return MemMCPTools._snap_queue
+
+    @staticmethod
+    async def _drain_snap_queue() -> None:
+        """Wait for queued snap jobs to be recorded, logging any that have to be dropped"""
+        if MemMCPTools._snap_queue is None:
+            return
+
+        queue = MemMCPTools._ensure_snap_worker()
+        try:
+            await asyncio.wait_for(queue.join(), SNAP_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if unrecorded := queue.qsize() + MemMCPTools._unrecorded_snap_jobs:
+                LOGGER.warning("Shutting down with %d snap job(s) not recorded", unrecorded)
+
+    @staticmethod
+    async def _snap_worker(queue: asyncio.Queue) -> None:
+        """Record queued snap jobs on the memov thread, coalescing bursts into one commit"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Taken off the queue but not recorded yet, in queue order
+            jobs = [await queue.get()]
+            try:
+                # Let a burst of snap() calls accumulate so it is recorded together
+                await asyncio.sleep(SNAP_BATCH_LINGER)
+                while len(jobs) < MAX_SNAP_BATCH and not queue.empty():
+                    jobs.append(queue.get_nowait())
+                batches = [
+                    list(project_jobs)
+                    for _, project_jobs in itertools.groupby(jobs, key=lambda job: job.project_path)
+                ]
+                for project_jobs in batches:
+                    await loop.run_in_executor(
+                        MemMCPTools._memov_executor,
+                        MemMCPTools._process_snap,
+                        SnapJob.merge(project_jobs),
+                    )
+                    del jobs[: len(project_jobs)]
+                    for _ in project_jobs:
+                        queue.task_done()
+            finally:
+                # Jobs still here were not confirmed recorded when the worker stopped mid-batch;
+                # count them so that shutdown reports them instead of treating the queue as drained
+                MemMCPTools._unrecorded_snap_jobs += len(jobs)
+                for _ in jobs:
+                    queue.task_done()
 
     @mcp.custom_route("/health", methods=["GET"])
     async def health(_req: Request) -> PlainTextResponse:
-        return PlainTextResponse("OK")
+        return HEALTH_RESPONSE
 
     # Core MCP tools for intelligent memov integration
     @staticmethod
     @mcp.tool()
-    def snap(
+    async def snap(
         user_prompt: str, original_response: str, agent_plan: list[str], files_changed: str = ""
     ) -> str:
         """Record every user interaction - MUST be called at the end of EVERY response.
@@ -174,48 +348,64 @@ class MemMCPTools:
                           (e.g. "file1.py,module1/file2.py"), or empty string "" if no files changed
 
         Returns:
-            Detailed result of the complete workflow execution
+            Acknowledgement that the interaction was queued; it is recorded in the background
         """
+        if MemMCPTools._project_path is None:
+            return "[ERROR] Error in snap: Project path is not set."
+
+        job = SnapJob(
+            project_path=MemMCPTools._project_path,
+            project_root=MemMCPTools._project_root_path,
+            user_prompt=user_prompt,
+            original_response=original_response,
+            agent_plan=agent_plan,
+            files_changed=files_changed,
+        )
         try:
-            LOGGER.info(
-                f"snap called with: files_changed='{files_changed}', project_path='{MemMCPTools._project_path}'"
-            )
-            LOGGER.info(
-                f"Using prompt: {user_prompt}, response: {original_response}, plan: {agent_plan}"
-            )
+            MemMCPTools._ensure_snap_worker().put_nowait(job)
+        except asyncio.QueueFull:
+            LOGGER.warning("Snap queue is full, dropping interaction: %s", user_prompt)
+            return "[ERROR] Snap queue is full, interaction was not recorded"
 
-            if MemMCPTools._project_path is None:
-                raise ValueError(f"Project path is not set.")
-
-            if not os.path.exists(MemMCPTools._project_path):
-                raise ValueError(f"Project path '{MemMCPTools._project_path}' does not exist.")
-
-            # Concatenate the agent plan into the original response for full context
-            agent_plan_dict = {
-                "plan" + str(i + 1): plan_step for i, plan_step in enumerate(agent_plan)
-            }
-            full_response = (
-                "[Agent Plan]:\n"
-                + '"planning_strategy": '
-                + str(agent_plan_dict)
-                + "\n\n[Agent Response]:\n"
-                + original_response
+        return f"[QUEUED] Interaction queued for recording\nPrompt: {user_prompt}"
+
+    @staticmethod
+    def _process_snap(job: SnapJob) -> str:
+        """Record a queued snap job in memov and return the detailed result"""
+        # Imported lazily to keep module import (and server startup) cheap
+        from memov.core.manager import MemStatus, index_status
+
+        try:
+            LOGGER.info(
+                "snap called with: files_changed='%s', project_path='%s'",
+                job.files_changed,
+                job.project_path,
             )
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    "Using prompt: %s, response: %s, plan: %s",
+                    job.user_prompt,
+                    job.original_response,
+                    job.agent_plan,
+                )
 
             # Prepare the variables
-            memov_manager = MemovManager(project_path=MemMCPTools._project_path)
-
-            # Step 1: Check if Memov is initialized
-            if (check_status := memov_manager.check()) is MemStatus.SUCCESS:
-                LOGGER.info("Memov is initialized.")
-            else:
-                LOGGER.warning(f"Memov is not initialized, return {check_status}.")
-                if (init_status := memov_manager.init()) is not MemStatus.SUCCESS:
-                    LOGGER.error(f"Failed to initialize Memov: {init_status}")
-                    return f"[ERROR] Failed to initialize Memov: {init_status}"
+            memov_manager = MemMCPTools._get_manager(job.project_path)
+
+            # Step 1: Check if Memov is initialized (once per project)
+            if job.project_path not in MemMCPTools._initialized_projects:
+                if (check_status := memov_manager.check()) is MemStatus.SUCCESS:
+                    LOGGER.info("Memov is initialized.")
+                else:
+                    LOGGER.warning("Memov is not initialized, return %s.", check_status)
+                    if (init_status := memov_manager.init()) is not MemStatus.SUCCESS:
+                        LOGGER.error("Failed to initialize Memov: %s", init_status)
+                        return f"[ERROR] Failed to initialize Memov: {init_status}"
+                MemMCPTools._initialized_projects.add(job.project_path)
 
             # Step 2: Handle two cases - with or without file changes
-            if not files_changed or files_changed.strip() == "":
+            file_names = [f for f in FILES_SPLIT_RE.split(job.files_changed.strip()) if f]
+            if not file_names:
                 # Case 1: No file changes - just record the interaction without snapshotting files
                 # We don't call snapshot() here because that would commit all tracked files,
                 # including any manual changes the user made
@@ -224,61 +414,64 @@ class MemMCPTools:
                 # TODO: In the future, we could record prompt-only interactions using git notes
                 # or a separate metadata system, without creating commits
 
-                result_parts = [
-                    "[SUCCESS] Interaction recorded (no file changes, no snapshot created)"
-                ]
-                result_parts.append(f"Prompt: {user_prompt}")
-                result_parts.append(f"Response: {len(full_response)} characters")
-                result = "\n".join(result_parts)
-                LOGGER.info(f"Interaction recorded successfully: {result}")
+                result = (
+                    "[SUCCESS] Interaction recorded (no file changes, no snapshot created)\n"
+                    f"Prompt: {job.user_prompt}\n"
+                    f"Response: {len(job.original_response)} characters"
+                )
+                LOGGER.info("Interaction recorded successfully: %s", result)
                 return result
 
             else:
                 # Case 2: Has file changes - track/snap files
-                LOGGER.info(f"Processing file changes: {files_changed}")
+                LOGGER.info("Processing file changes: %s", job.files_changed)
 
                 # Check file status
                 ret_status, current_file_status = memov_manager.status()
                 if ret_status is not MemStatus.SUCCESS:
-                    LOGGER.error(f"Failed to check file status: {ret_status}")
+                    LOGGER.error("Failed to check file status: %s", ret_status)
                     return f"[ERROR] Failed to check file status: {ret_status}"
 
-                # Build set of AI-changed files (from files_changed parameter)
-                ai_changed_files = set()
-                for file_changed in files_changed.split(","):
-                    file_changed = file_changed.strip()
-                    if file_changed:
-                        file_path = Path(MemMCPTools._project_path) / file_changed
-                        ai_changed_files.add(file_path.resolve())
+                # Concatenate the agent plan into the original response for full context
+                full_response = build_full_response(job.agent_plan, job.original_response)
+
+                # Index the status as sets of canonical path strings for O(1) lookups
+                status_index = index_status(current_file_status)
+
+                # Resolve each AI-changed file once, keyed by real path so that entries repeated
+                # in files_changed (or spelled differently) are only tracked/snapped once
+                parsed_files = {}
+                for file_changed in file_names:
+                    file_path = os.path.join(job.project_path, file_changed)
+                    parsed_files.setdefault(os.path.realpath(file_path), (file_changed, file_path))
 
                 # Detect manual edits: modified files that are NOT in AI-changed list
+                # Both sides are real paths, so containment is a plain string prefix test
                 manual_edit_files = []
-                project_path_resolved = Path(MemMCPTools._project_path).resolve()
-                for modified_file in current_file_status["modified"]:
-                    # modified_file is already a Path object with absolute path (resolved)
-                    if modified_file.resolve() not in ai_changed_files:
-                        # Use relative path (relative to project_path) for snapshot
-                        try:
-                            rel_path = str(modified_file.relative_to(project_path_resolved))
-                            manual_edit_files.append(rel_path)
-                        except ValueError:
-                            # File is outside project path, use absolute path
-                            LOGGER.warning(f"File {modified_file} is outside project path")
-                            manual_edit_files.append(str(modified_file))
+                project_root_prefix = os.path.join(job.project_root, "")
+                for modified_file in sorted(status_index["modified"].difference(parsed_files)):
+                    # Use relative path (relative to project_path) for snapshot
+                    if modified_file.startswith(project_root_prefix):
+                        manual_edit_files.append(modified_file[len(project_root_prefix) :])
+                    else:
+                        # File is outside project path, use absolute path
+                        LOGGER.warning("File %s is outside project path", modified_file)
+                        manual_edit_files.append(modified_file)
 
                 # Step 1: Capture manual edits first (if any)
                 if manual_edit_files:
-                    LOGGER.info(f"Detected manual edits: {manual_edit_files}")
+                    LOGGER.info("Detected manual edits: %s", manual_edit_files)
+                    manual_edit_names = ", ".join(os.path.basename(f) for f in manual_edit_files)
                     manual_snap_status = memov_manager.snapshot(
                         file_paths=manual_edit_files,
                         prompt="Manual edits detected before AI operation",
-                        response=f"User manually edited: {', '.join([Path(f).name for f in manual_edit_files])}",
+                        response=f"User manually edited: {manual_edit_names}",
                         by_user=True,
                     )
                     if manual_snap_status is not MemStatus.SUCCESS:
-                        LOGGER.error(f"Failed to snapshot manual edits: {manual_snap_status}")
+                        LOGGER.error("Failed to snapshot manual edits: %s", manual_snap_status)
                         return f"[ERROR] Failed to snapshot manual edits: {manual_snap_status}"
-                    LOGGER.info(f"Captured manual edits in separate commit")
+                    LOGGER.info("Captured manual edits in separate commit")
 
                 # Step 2: Process AI changes
                 # Separate AI-changed files into untracked and modified
@@ -286,78 +479,92 @@ class MemMCPTools:
                 files_to_snap = []
                 files_processed = []
 
-                for file_changed in files_changed.split(","):
-                    file_changed = file_changed.strip()
-                    if not file_changed:
-                        continue
-
-                    file_changed_Path = Path(MemMCPTools._project_path) / file_changed
-
+                for real_path, (file_changed, file_changed_path) in parsed_files.items():
                     # Check if file is untracked
-                    is_untracked = False
-                    for untracked_file in current_file_status["untracked"]:
-                        if file_changed_Path.samefile(untracked_file):
-                            is_untracked = True
-                            break
-
-                    if is_untracked:
-                        files_to_track.append(str(file_changed_Path))
+                    if real_path in status_index["untracked"]:
+                        files_to_track.append(file_changed_path)
                         files_processed.append(f"{file_changed} (tracked)")
                     else:
-                        files_to_snap.append(str(file_changed_Path))
+                        files_to_snap.append(file_changed_path)
                         files_processed.append(f"{file_changed} (snapped)")
 
                 # Track all untracked files at once
                 if files_to_track:
-                    LOGGER.info(f"Tracking new files: {files_to_track}")
+                    LOGGER.info("Tracking new files: %s", files_to_track)
                     track_status = memov_manager.track(
                         files_to_track,
-                        prompt=user_prompt,
+                        prompt=job.user_prompt,
                         response=full_response,
                         by_user=False,
                     )
                     if track_status is not MemStatus.SUCCESS:
-                        LOGGER.error(f"Failed to track files: {track_status}")
+                        LOGGER.error("Failed to track files: %s", track_status)
                         return f"[ERROR] Failed to track files: {track_status}"
 
                 # Snap all AI-modified files at once (fine-grained snapshot)
                 if files_to_snap:
-                    LOGGER.info(f"Snapping AI-modified files: {files_to_snap}")
+                    LOGGER.info("Snapping AI-modified files: %s", files_to_snap)
                     snap_status = memov_manager.snapshot(
                         file_paths=files_to_snap,
-                        prompt=user_prompt,
+                        prompt=job.user_prompt,
                         response=full_response,
                         by_user=False,
                     )
                     if snap_status is not MemStatus.SUCCESS:
-                        LOGGER.error(f"Failed to snap files: {snap_status}")
+                        LOGGER.error("Failed to snap files: %s", snap_status)
                         return f"[ERROR] Failed to snap files: {snap_status}"
 
                 # Build detailed result message
-                result_parts = ["[SUCCESS] Changes recorded successfully"]
-                if manual_edit_files:
-                    result_parts.append(
-                        f"Manual edits captured: {', '.join([Path(f).name for f in manual_edit_files])}"
-                    )
-                result_parts.append(f"Prompt: {user_prompt}")
-                result_parts.append(f"Response: {len(full_response)} characters")
-                result_parts.append(f"AI changes: {', '.join(files_processed)}")
-                result = "\n".join(result_parts)
-                LOGGER.info(f"Operation completed successfully: {result}")
+                manual_edit_line = (
+                    f"Manual edits captured: {manual_edit_names}\n" if manual_edit_files else ""
+                )
+                result = (
+                    "[SUCCESS] Changes recorded successfully\n"
+                    f"{manual_edit_line}"
+                    f"Prompt: {job.user_prompt}\n"
+                    f"Response: {len(full_response)} characters\n"
+                    f"AI changes: {', '.join(files_processed)}"
+                )
+                LOGGER.info("Operation completed successfully: %s", result)
                 return result
 
+        except (OSError, ValueError) as e:
+            # Expected failures such as a vanished project or file; no traceback needed
+            MemMCPTools._initialized_projects.discard(job.project_path)
+            error_msg = f"[ERROR] Error in snap: {str(e)}"
+            LOGGER.warning(error_msg)
+            return error_msg
         except Exception as e:
+            # Re-run the initialization check on the next call in case the repo went away
+            MemMCPTools._initialized_projects.discard(job.project_path)
             error_msg = f"[ERROR] Error in snap: {str(e)}"
             LOGGER.error(error_msg, exc_info=True)
             return error_msg
 
 
 def main():
-    """Main entry point for the MCP server"""
-    import asyncio
-
-    mem_mcp_tools = MemMCPTools("D:/Projects/temp")
-    asyncio.run(mem_mcp_tools.mcp.call_tool("mem_snap", {"files_changed": "123.py"}))
+    """Record one manual snap: python -m mem_mcp_server.server.mcp_server <project_path> [files]"""
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} <project_path> [files_changed]", file=sys.stderr)
+        sys.exit(1)
+    project_path = sys.argv[1]
+    files_changed = sys.argv[2] if len(sys.argv) > 2 else ""
+
+    async def snap_and_wait() -> None:
+        # Call the tool function directly instead of routing it through FastMCP
+        result = await MemMCPTools.snap(
+            user_prompt="(manual run)",
+            original_response="",
+            agent_plan=[],
+            files_changed=files_changed,
+        )
+        print(result)
+        # Let the background worker record the queued job before the loop shuts down
+        if MemMCPTools._snap_queue is not None:
+            await MemMCPTools._snap_queue.join()
+
+    MemMCPTools(project_path)
+    asyncio.run(snap_and_wait())
 
 
 if __name__ == "__main__":
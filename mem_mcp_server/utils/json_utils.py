@@ -0,0 +1,31 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the stdlib
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Deserialize JSON from bytes or str, raising json.JSONDecodeError on bad input"""
+    # Checked here so both backends reject other types with the same TypeError
+    if not isinstance(data, (bytes, bytearray, str)):
+        raise TypeError(f"JSON input must be str or bytes, not {type(data).__name__}")
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
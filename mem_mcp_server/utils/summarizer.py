@@ -2,12 +2,15 @@
 Summarizer module for generating AI-powered summaries using OpenAI API
 """
 
+import asyncio
 import json
 import logging
 import os
-import urllib.parse
-import urllib.request
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from mem_mcp_server.utils.json_utils import json_dumps, json_loads
 
 try:
     from dotenv import load_dotenv
@@ -21,30 +24,144 @@ except ImportError:
 
 LOGGER = logging.getLogger(__name__)
 
+# Whether the .env files have been reloaded with override for summarizer instances
+ENV_RELOADED = False
+
+
+def _load_env_once(force: bool = False) -> None:
+    """Reload .env files with override the first time, or again when force is set"""
+    global ENV_RELOADED
+    if not DOTENV_AVAILABLE or (ENV_RELOADED and not force):
+        return
+
+    try:
+        load_dotenv(".env.local", override=True)
+        load_dotenv(".env", override=True)
+        LOGGER.info("Reloaded .env files")
+    except Exception as e:
+        LOGGER.warning(f"Failed to reload .env files: {e}")
+        return
+
+    ENV_RELOADED = True
+
+
+# Structured output schema for the summary, shared by every summarizer instance
+OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "primary_request_and_intent": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "All user explicit requests and intents in detail",
+        },
+        "key_technical_concepts": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Important technical concepts, technologies, and frameworks",
+        },
+        "files_and_code_sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "file_name": {"type": "string"},
+                    "importance": {"type": "string"},
+                    "changes_made": {"type": "string"},
+                    "code_snippet": {"type": "string"},
+                },
+            },
+            "description": "Files examined, modified, or created with code details",
+        },
+        "errors_and_fixes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "error_description": {"type": "string"},
+                    "fix_applied": {"type": "string"},
+                    "user_feedback": {"type": "string"},
+                },
+            },
+            "description": "Errors encountered and how they were resolved",
+        },
+        "problem_solving": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Problems solved and ongoing troubleshooting efforts",
+        },
+        "all_user_messages": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "All non-tool user messages for understanding feedback",
+        },
+        "pending_tasks": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Tasks explicitly asked to work on",
+        },
+        "current_work": {
+            "type": "string",
+            "description": "Precise description of work being done before this summary",
+        },
+        "next_steps": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Recommended next steps based on explicit user requests",
+        },
+    },
+    "required": [
+        "primary_request_and_intent",
+        "key_technical_concepts",
+        "files_and_code_sections",
+        "errors_and_fixes",
+        "problem_solving",
+        "current_work",
+    ],
+}
+
+# System prompt that asks for JSON matching OUTPUT_SCHEMA, rendered once at import
+JSON_SYSTEM_PROMPT = f"""You are an expert development assistant specializing in analyzing commit history and creating detailed project summaries. 
+
+You must respond with a valid JSON object following this exact schema:
+
+{json.dumps(OUTPUT_SCHEMA, indent=2)}
+
+Instructions for analysis:
+1. Analyze each commit chronologically
+2. Extract user requests and intents behind changes
+3. Identify technical decisions and code patterns  
+4. Document file changes with specific details
+5. Note errors encountered and how they were resolved
+6. Track ongoing troubleshooting efforts
+
+Focus on:
+- Full code snippets where applicable
+- Function signatures and architectural decisions
+- Test outputs and code changes
+- User feedback and changing requirements
+- Specific file names and their importance
+
+Create comprehensive analysis that allows another developer to understand full context and continue work seamlessly.
+
+IMPORTANT: Your response must be valid JSON only, no additional text or formatting."""
+
 
 class HTTPOpenAISummarizer:
     """
     HTTP-based OpenAI summarizer that doesn't depend on the openai package
     """
 
-    def __init__(self, api_key: str = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: str = None, model: str = "gpt-4o-mini", reload_env: bool = False):
         """
         Initialize the HTTP OpenAI summarizer
 
         Args:
             api_key: OpenAI API key (will use OPENAI_API_KEY env var if not provided)
             model: OpenAI model to use for summarization
+            reload_env: Re-read .env files even if they were already loaded in this process
         """
-        # Try to reload .env files each time (for MCP server context)
-        if DOTENV_AVAILABLE:
-            try:
-                from dotenv import load_dotenv
-
-                load_dotenv(".env.local", override=True)
-                load_dotenv(".env", override=True)
-                LOGGER.info("Reloaded .env files")
-            except Exception as e:
-                LOGGER.warning(f"Failed to reload .env files: {e}")
+        # Load .env files once per process (for MCP server context)
+        _load_env_once(force=reload_env)
 
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.model = model
@@ -52,6 +169,49 @@ class HTTPOpenAISummarizer:
 
         LOGGER.info(f"API key set: {'Yes' if self.api_key else 'No'}")
 
+        # Pooled client so repeated summaries reuse the TCP/TLS connection to the API,
+        # created on the first synchronous request
+        self._client: Optional[httpx.Client] = None
+        # Async counterpart shared by the async methods, closed by aclose()
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    def __enter__(self) -> "HTTPOpenAISummarizer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "HTTPOpenAISummarizer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections of both the async and the sync client"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    def _get_client(self) -> httpx.Client:
+        """Return the pooled HTTP client, creating it on first use"""
+        if self._client is None:
+            self._client = httpx.Client(timeout=60, headers=self._get_headers())
+        return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async HTTP client, creating it on first use"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=60, headers=self._get_headers())
+        return self._async_client
+
     def is_available(self) -> bool:
         """Check if the summarizer is ready to use"""
         return bool(self.api_key)
@@ -67,88 +227,126 @@ class HTTPOpenAISummarizer:
             Generated summary text
         """
         if not self.is_available():
-            return f"❌ OpenAI API key not found. Please set OPENAI_API_KEY in .env or .env.local file.\n💡 Current working directory: {os.getcwd()}\n💡 Checked environment variable: {bool(os.environ.get('OPENAI_API_KEY'))}"
+            return self._get_missing_key_message()
 
         try:
-            # Prepare the request data using standard chat completions with JSON mode
-            data = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": self._get_json_system_prompt()},
-                    {
-                        "role": "user",
-                        "content": f"Analyze and summarize the following commit history and context:\n\n{context}",
-                    },
-                ],
-                "response_format": {"type": "json_object"},
-                "temperature": 0.1,
-                "max_tokens": 4000,
-            }
-
-            # Convert to JSON
-            json_data = json.dumps(data).encode("utf-8")
-
-            # Create the HTTP request
-            req = urllib.request.Request(
-                self.api_url,
-                data=json_data,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}",
-                },
+            response = self._get_client().post(
+                self.api_url, content=json_dumps(self._build_request_data(context))
             )
-
-            # Make the request
-            with urllib.request.urlopen(req, timeout=60) as response:
-                response_data = json.loads(response.read().decode("utf-8"))
-
-            if "choices" in response_data and len(response_data["choices"]) > 0:
-                # The content should already be structured JSON
-                content = response_data["choices"][0]["message"]["content"]
-                # Try to parse and reformat the JSON to ensure it's valid
-                try:
-                    parsed_json = json.loads(content)
-                    return json.dumps(parsed_json, indent=2, ensure_ascii=False)
-                except json.JSONDecodeError:
-                    # If not valid JSON, return as is
-                    return content
-            else:
-                return f"❌ Unexpected response format: {response_data}"
-
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else "No error details"
-            LOGGER.error(f"HTTP Error calling OpenAI API: {e.code} - {error_body}")
-            return f"❌ HTTP Error {e.code}: {error_body}"
+            return self._handle_response(response)
         except Exception as e:
             LOGGER.error(f"Error calling OpenAI API: {e}", exc_info=True)
             return f"❌ Error generating AI summary: {str(e)}"
 
-    def _get_json_system_prompt(self) -> str:
-        """Get optimized system prompt that ensures JSON output"""
-        return f"""You are an expert development assistant specializing in analyzing commit history and creating detailed project summaries. 
+    async def generate_summaries_async(
+        self, contexts: List[str], max_inflight: int = 8
+    ) -> List[str]:
+        """
+        Generate summaries for several contexts concurrently
 
-You must respond with a valid JSON object following this exact schema:
+        Args:
+            contexts: The commit histories and contexts to summarize
+            max_inflight: Maximum number of API requests in flight at once
 
-{json.dumps(self._get_output_schema(), indent=2)}
+        Returns:
+            Generated summary texts, in the same order as contexts
+        """
+        if max_inflight < 1:
+            raise ValueError(f"max_inflight must be at least 1, got {max_inflight}")
+        if not self.is_available():
+            return [self._get_missing_key_message()] * len(contexts)
 
-Instructions for analysis:
-1. Analyze each commit chronologically
-2. Extract user requests and intents behind changes
-3. Identify technical decisions and code patterns  
-4. Document file changes with specific details
-5. Note errors encountered and how they were resolved
-6. Track ongoing troubleshooting efforts
+        semaphore = asyncio.Semaphore(max_inflight)
 
-Focus on:
-- Full code snippets where applicable
-- Function signatures and architectural decisions
-- Test outputs and code changes
-- User feedback and changing requirements
-- Specific file names and their importance
+        async def summarize(context: str) -> str:
+            async with semaphore:
+                return await self._post_summary_async(context)
 
-Create comprehensive analysis that allows another developer to understand full context and continue work seamlessly.
+        return list(await asyncio.gather(*(summarize(context) for context in contexts)))
 
-IMPORTANT: Your response must be valid JSON only, no additional text or formatting."""
+    async def generate_summary_async(self, context: str) -> str:
+        """
+        Generate a summary without blocking the running event loop
+
+        Args:
+            context: The commit history and context to summarize
+
+        Returns:
+            Generated summary text
+        """
+        if not self.is_available():
+            return self._get_missing_key_message()
+
+        return await self._post_summary_async(context)
+
+    async def _post_summary_async(self, context: str) -> str:
+        """Send one summary request through the pooled async client"""
+        try:
+            response = await self._get_async_client().post(
+                self.api_url, content=json_dumps(self._build_request_data(context))
+            )
+            return self._handle_response(response)
+        except Exception as e:
+            LOGGER.error(f"Error calling OpenAI API: {e}", exc_info=True)
+            return f"❌ Error generating AI summary: {str(e)}"
+
+    def _get_missing_key_message(self) -> str:
+        """Get the message returned when no API key is configured"""
+        return f"❌ OpenAI API key not found. Please set OPENAI_API_KEY in .env or .env.local file.\n💡 Current working directory: {os.getcwd()}\n💡 Checked environment variable: {bool(os.environ.get('OPENAI_API_KEY'))}"
+
+    def _get_headers(self) -> Dict[str, str]:
+        """Get the HTTP headers sent with every API request"""
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
+
+    def _build_request_data(self, context: str) -> Dict[str, Any]:
+        """Build the chat completions request body, using JSON mode"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self._get_json_system_prompt()},
+                {
+                    "role": "user",
+                    "content": f"Analyze and summarize the following commit history and context:\n\n{context}",
+                },
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,
+            "max_tokens": 4000,
+        }
+
+    def _handle_response(self, response: httpx.Response) -> str:
+        """Turn an API response into the summary text or an error message"""
+        if response.is_error:
+            error_body = response.text or "No error details"
+            LOGGER.error(f"HTTP Error calling OpenAI API: {response.status_code} - {error_body}")
+            return f"❌ HTTP Error {response.status_code}: {error_body}"
+
+        return self._format_response(json_loads(response.content))
+
+    def _format_response(self, response_data: Dict[str, Any]) -> str:
+        """Extract the summary from a chat completions response, pretty-printing it if it is JSON"""
+        if "choices" in response_data and len(response_data["choices"]) > 0:
+            # The content should already be structured JSON
+            content = response_data["choices"][0]["message"]["content"]
+            if not isinstance(content, str):
+                # e.g. a refusal or tool call, which carries no text content
+                return f"❌ Unexpected response format: {response_data}"
+            # Try to parse and reformat the JSON to ensure it's valid
+            try:
+                parsed_json = json_loads(content)
+                return json_dumps(parsed_json, indent=True).decode("utf-8")
+            except json.JSONDecodeError:
+                # If not valid JSON, return as is
+                return content
+        else:
+            return f"❌ Unexpected response format: {response_data}"
+
+    def _get_json_system_prompt(self) -> str:
+        """Get optimized system prompt that ensures JSON output"""
+        return JSON_SYSTEM_PROMPT
 
     def _get_optimized_instructions(self) -> str:
         """Get optimized instructions for the new responses API"""
@@ -173,78 +371,7 @@ Create a comprehensive analysis that would allow another developer to understand
 
     def _get_output_schema(self) -> dict:
         """Define the structured output schema for the summary"""
-        return {
-            "type": "object",
-            "properties": {
-                "primary_request_and_intent": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "All user explicit requests and intents in detail",
-                },
-                "key_technical_concepts": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Important technical concepts, technologies, and frameworks",
-                },
-                "files_and_code_sections": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "file_name": {"type": "string"},
-                            "importance": {"type": "string"},
-                            "changes_made": {"type": "string"},
-                            "code_snippet": {"type": "string"},
-                        },
-                    },
-                    "description": "Files examined, modified, or created with code details",
-                },
-                "errors_and_fixes": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "error_description": {"type": "string"},
-                            "fix_applied": {"type": "string"},
-                            "user_feedback": {"type": "string"},
-                        },
-                    },
-                    "description": "Errors encountered and how they were resolved",
-                },
-                "problem_solving": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Problems solved and ongoing troubleshooting efforts",
-                },
-                "all_user_messages": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "All non-tool user messages for understanding feedback",
-                },
-                "pending_tasks": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Tasks explicitly asked to work on",
-                },
-                "current_work": {
-                    "type": "string",
-                    "description": "Precise description of work being done before this summary",
-                },
-                "next_steps": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Recommended next steps based on explicit user requests",
-                },
-            },
-            "required": [
-                "primary_request_and_intent",
-                "key_technical_concepts",
-                "files_and_code_sections",
-                "errors_and_fixes",
-                "problem_solving",
-                "current_work",
-            ],
-        }
+        return OUTPUT_SCHEMA
 
     def _get_system_prompt(self) -> str:
         """Get the detailed system prompt for summarization"""
@@ -282,6 +409,49 @@ When summarizing the conversation focus on typescript code changes and also reme
 When you are using compact - please focus on test output and code changes. Include file reads verbatim."""
 
 
+def _build_commit_context(commit_details: List[Dict[str, Any]]) -> str:
+    """Concatenate commit details into the context string sent for summarization"""
+    # One preformatted block per commit, separated by an empty line
+    return "\n".join(
+        f"=== Commit {i}: {commit.get('commit_hash', 'unknown')} ===\n"
+        f"Summary: {commit.get('summary_line', 'No summary')}\n"
+        f"Details:\n{commit.get('details', 'No details available')}\n"
+        for i, commit in enumerate(commit_details, 1)
+    )
+
+
+def _build_ai_summary(
+    commit_details: List[Dict[str, Any]], context: str, ai_summary: str, ai_available: bool
+) -> Dict[str, Any]:
+    """Wrap an AI-generated summary with metadata about the analyzed commits"""
+    return {
+        "ai_generated_summary": ai_summary,
+        "metadata": {
+            "commits_analyzed": len(commit_details),
+            "commit_hashes": [commit.get("commit_hash", "unknown") for commit in commit_details],
+            "generation_method": (
+                "http_openai_api"
+                if ai_available and not ai_summary.startswith("❌")
+                else "fallback"
+            ),
+        },
+        "raw_context": context,
+    }
+
+
+def _build_basic_summary(commit_details: List[Dict[str, Any]], context: str) -> Dict[str, Any]:
+    """Build the summary used when AI summarization is disabled"""
+    return {
+        "basic_summary": f"Analyzed {len(commit_details)} commits",
+        "metadata": {
+            "commits_analyzed": len(commit_details),
+            "commit_hashes": [commit.get("commit_hash", "unknown") for commit in commit_details],
+            "generation_method": "basic",
+        },
+        "raw_context": context,
+    }
+
+
 def create_summary_from_commits(
     commit_details: List[Dict[str, Any]], use_ai: bool = True
 ) -> Dict[str, Any]:
@@ -296,45 +466,62 @@ def create_summary_from_commits(
         Dictionary containing the generated summary
     """
     # Create context string by concatenating all commit details
-    context_parts = []
-    for i, commit in enumerate(commit_details, 1):
-        context_parts.append(f"=== Commit {i}: {commit.get('commit_hash', 'unknown')} ===")
-        context_parts.append(f"Summary: {commit.get('summary_line', 'No summary')}")
-        context_parts.append(f"Details:\n{commit.get('details', 'No details available')}")
-        context_parts.append("")  # Empty line separator
-
-    context = "\n".join(context_parts)
+    context = _build_commit_context(commit_details)
 
     if use_ai:
-        # Try AI summarization using HTTP client (no dependencies)
-        summarizer = HTTPOpenAISummarizer()
-        ai_summary = summarizer.generate_summary(context)
+        # Try AI summarization using HTTP client (no openai package needed)
+        with HTTPOpenAISummarizer() as summarizer:
+            ai_summary = summarizer.generate_summary(context)
 
-        return {
-            "ai_generated_summary": ai_summary,
-            "metadata": {
-                "commits_analyzed": len(commit_details),
-                "commit_hashes": [
-                    commit.get("commit_hash", "unknown") for commit in commit_details
-                ],
-                "generation_method": (
-                    "http_openai_api"
-                    if summarizer.is_available() and not ai_summary.startswith("❌")
-                    else "fallback"
-                ),
-            },
-            "raw_context": context,
-        }
+        return _build_ai_summary(commit_details, context, ai_summary, summarizer.is_available())
     else:
         # Fallback to basic analysis
-        return {
-            "basic_summary": f"Analyzed {len(commit_details)} commits",
-            "metadata": {
-                "commits_analyzed": len(commit_details),
-                "commit_hashes": [
-                    commit.get("commit_hash", "unknown") for commit in commit_details
-                ],
-                "generation_method": "basic",
-            },
-            "raw_context": context,
-        }
+        return _build_basic_summary(commit_details, context)
+
+
+async def create_summary_from_commits_async(
+    commit_details: List[Dict[str, Any]], use_ai: bool = True
+) -> Dict[str, Any]:
+    """
+    Create a comprehensive summary from commit details without blocking the event loop
+
+    Args:
+        commit_details: List of commit information dictionaries
+        use_ai: Whether to use AI summarization (requires OpenAI API key)
+
+    Returns:
+        Dictionary containing the generated summary
+    """
+    context = _build_commit_context(commit_details)
+
+    if use_ai:
+        async with HTTPOpenAISummarizer() as summarizer:
+            ai_summary = await summarizer.generate_summary_async(context)
+
+        return _build_ai_summary(commit_details, context, ai_summary, summarizer.is_available())
+    else:
+        return _build_basic_summary(commit_details, context)
+
+
+async def create_summaries_from_commits_batch(
+    commit_groups: List[List[Dict[str, Any]]], max_inflight: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    Create AI summaries for several groups of commits concurrently
+
+    Args:
+        commit_groups: One list of commit information dictionaries per summary
+        max_inflight: Maximum number of API requests in flight at once
+
+    Returns:
+        One summary dictionary per commit group, in the same order
+    """
+    contexts = [_build_commit_context(commit_details) for commit_details in commit_groups]
+
+    async with HTTPOpenAISummarizer() as summarizer:
+        ai_summaries = await summarizer.generate_summaries_async(contexts, max_inflight)
+
+    return [
+        _build_ai_summary(commit_details, context, ai_summary, summarizer.is_available())
+        for commit_details, context, ai_summary in zip(commit_groups, contexts, ai_summaries)
+    ]
@@ -28,6 +28,14 @@ class MemStatus(Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
+def index_status(file_status: dict[str, list[Path]]) -> dict[str, frozenset[str]]:
+    """Index a status() result as frozensets of canonical path strings, keyed by state."""
+    return {
+        state: frozenset(os.path.realpath(path) for path in paths)
+        for state, paths in file_status.items()
+    }
+
+
 class MemovManager:
     def __init__(
         self,
@@ -0,0 +1,135 @@
+"""
+Tests for the servers.jsonl PID store of the server CLI
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mem_mcp_server.cli import server_cli
+
+
+def server_info(pid: int, port: int = 8000) -> dict:
+    return {"pid": pid, "workspace": f"/ws{pid}", "port": port, "host": "127.0.0.1"}
+
+
+class ServerStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.config_dir = Path(self._tmp.name)
+        patcher = mock.patch.object(server_cli, "CONFIG_DIR", self.config_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def new_cli(self) -> server_cli.ServerCLI:
+        """A fresh CLI, so servers are read back from disk instead of the cache"""
+        return server_cli.ServerCLI()
+
+    def pid_file_lines(self) -> list[str]:
+        return (self.config_dir / "servers.jsonl").read_text(encoding="utf-8").splitlines()
+
+    def test_save_and_reload(self):
+        cli = self.new_cli()
+        cli.set_server("/a", server_info(1))
+        cli.set_server("/b", server_info(2))
+        cli.save_servers()
+
+        self.assertEqual(
+            self.new_cli().load_servers(), {"/a": server_info(1), "/b": server_info(2)}
+        )
+
+    def test_changes_are_appended(self):
+        cli = self.new_cli()
+        cli.set_server("/a", server_info(1))
+        cli.save_servers()
+        cli.set_server("/a", server_info(3))
+        cli.remove_server("/a")
+        cli.set_server("/b", server_info(2))
+        cli.save_servers()
+
+        self.assertEqual(len(self.pid_file_lines()), 3)
+        self.assertEqual(json.loads(self.pid_file_lines()[1]), {"key": "/a", "deleted": True})
+        self.assertEqual(self.new_cli().load_servers(), {"/b": server_info(2)})
+
+    def test_stale_records_are_compacted(self):
+        cli = self.new_cli()
+        cli.COMPACT_THRESHOLD = 3
+        for pid in range(10):
+            cli.set_server("/a", server_info(pid))
+            cli.save_servers()
+
+        self.assertLessEqual(len(self.pid_file_lines()), 1 + cli.COMPACT_THRESHOLD)
+        self.assertEqual(self.new_cli().load_servers(), {"/a": server_info(9)})
+
+    def test_replacing_all_servers_rewrites_the_file(self):
+        cli = self.new_cli()
+        cli.set_server("/a", server_info(1))
+        cli.save_servers()
+        cli.save_servers({"/b": server_info(2)})
+
+        self.assertEqual(len(self.pid_file_lines()), 1)
+        self.assertEqual(self.new_cli().load_servers(), {"/b": server_info(2)})
+
+    def test_torn_trailing_line_is_not_appended_to(self):
+        pid_file = self.config_dir / "servers.jsonl"
+        pid_file.write_text(
+            json.dumps({"key": "/a", "info": server_info(1)}) + '\n{"key":"/b","inf',
+            encoding="utf-8",
+        )
+
+        cli = self.new_cli()
+        self.assertEqual(cli.load_servers(), {"/a": server_info(1)})
+        cli.set_server("/c", server_info(3))
+        cli.save_servers()
+
+        self.assertEqual(
+            self.new_cli().load_servers(), {"/a": server_info(1), "/c": server_info(3)}
+        )
+        self.assertTrue(pid_file.read_bytes().endswith(b"\n"))
+
+    def test_malformed_records_are_skipped(self):
+        pid_file = self.config_dir / "servers.jsonl"
+        pid_file.write_text(
+            "[1]\n"
+            '"text"\n'
+            '{"info": {"pid": 9}}\n'
+            '{"key": "/no-info"}\n' + json.dumps({"key": "/a", "info": server_info(1)}) + "\n",
+            encoding="utf-8",
+        )
+
+        cli = self.new_cli()
+        self.assertEqual(cli.load_servers(), {"/a": server_info(1)})
+        cli.save_servers()
+        self.assertEqual(len(self.pid_file_lines()), 1)
+
+    def test_legacy_servers_json_is_migrated(self):
+        legacy_file = self.config_dir / "servers.json"
+        legacy_file.write_text(json.dumps({"/a": server_info(1)}), encoding="utf-8")
+
+        self.assertEqual(self.new_cli().load_servers(), {"/a": server_info(1)})
+        self.assertFalse(legacy_file.exists())
+        self.assertEqual(self.new_cli().load_servers(), {"/a": server_info(1)})
+
+    def test_unreadable_legacy_servers_json_is_dropped(self):
+        legacy_file = self.config_dir / "servers.json"
+        legacy_file.write_text("{not json", encoding="utf-8")
+
+        self.assertEqual(self.new_cli().load_servers(), {})
+        self.assertFalse(legacy_file.exists())
+
+    def test_legacy_file_is_ignored_once_jsonl_exists(self):
+        cli = self.new_cli()
+        cli.set_server("/a", server_info(1))
+        cli.save_servers()
+        legacy_file = self.config_dir / "servers.json"
+        legacy_file.write_text(json.dumps({"/old": server_info(2)}), encoding="utf-8")
+
+        self.assertEqual(self.new_cli().load_servers(), {"/a": server_info(1)})
+        self.assertTrue(legacy_file.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests for batching queued snap jobs into memov commits
+"""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mem_mcp_server.server.mcp_server import MemMCPTools, SnapJob
+
+
+def snap_job(prompt: str, files_changed: str = "", project_path: str = "/p", plan=()) -> SnapJob:
+    return SnapJob(
+        project_path=project_path,
+        project_root=Path(project_path),
+        user_prompt=prompt,
+        original_response=f"response to {prompt}",
+        agent_plan=list(plan),
+        files_changed=files_changed,
+    )
+
+
+class SnapJobMergeTest(unittest.TestCase):
+    def test_single_job_is_returned_unchanged(self):
+        job = snap_job("only", "a.py")
+        self.assertIs(SnapJob.merge([job]), job)
+
+    def test_merge_mixes_prompt_only_and_file_change_jobs(self):
+        merged = SnapJob.merge(
+            [
+                snap_job("question"),
+                snap_job("edit a", "a.py, b.py", plan=["a.py: edit", "b.py: edit"]),
+                snap_job("chat", "  "),
+                snap_job("edit c", "c.py", plan=["c.py: add"]),
+            ]
+        )
+
+        self.assertEqual(merged.user_prompt, "question\n\nedit a\n\nchat\n\nedit c")
+        self.assertEqual(
+            merged.original_response,
+            "response to question\n\nresponse to edit a\n\nresponse to chat\n\nresponse to edit c",
+        )
+        self.assertEqual(merged.agent_plan, ["a.py: edit", "b.py: edit", "c.py: add"])
+        # Prompt-only jobs contribute no empty entries to the file list
+        self.assertEqual(merged.files_changed, "a.py, b.py,c.py")
+        self.assertEqual(merged.project_path, "/p")
+
+    def test_merge_of_prompt_only_jobs_has_no_files(self):
+        merged = SnapJob.merge([snap_job("one"), snap_job("two")])
+        self.assertEqual(merged.files_changed, "")
+
+
+class SnapWorkerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        MemMCPTools(self._tmp.name)
+
+        self.recorded: list[SnapJob] = []
+        patcher = mock.patch.object(
+            MemMCPTools, "_process_snap", staticmethod(self.recorded.append)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Each test runs on its own event loop, so start from a fresh worker and queue
+        MemMCPTools._snap_queue = None
+        MemMCPTools._snap_worker_task = None
+        MemMCPTools._unrecorded_snap_jobs = 0
+
+    async def asyncTearDown(self):
+        MemMCPTools._snap_worker_task.cancel()
+
+    async def test_burst_is_recorded_as_one_job(self):
+        await MemMCPTools.snap(user_prompt="question", original_response="r", agent_plan=[])
+        await MemMCPTools.snap(
+            user_prompt="edit", original_response="r", agent_plan=["a.py: x"], files_changed="a.py"
+        )
+        await MemMCPTools._snap_queue.join()
+
+        self.assertEqual(len(self.recorded), 1)
+        self.assertEqual(self.recorded[0].user_prompt, "question\n\nedit")
+        self.assertEqual(self.recorded[0].files_changed, "a.py")
+
+    async def test_jobs_of_different_projects_are_not_merged(self):
+        queue = MemMCPTools._ensure_snap_worker()
+        for job in (snap_job("a1", project_path="/a"), snap_job("b1", project_path="/b")):
+            queue.put_nowait(job)
+        await queue.join()
+
+        self.assertEqual([job.user_prompt for job in self.recorded], ["a1", "b1"])
+
+    async def test_cancelled_batch_is_reported_as_unrecorded(self):
+        queue = MemMCPTools._ensure_snap_worker()
+        queue.put_nowait(snap_job("lost"))
+        await asyncio.sleep(0)  # Let the worker take the job off the queue
+        MemMCPTools._snap_worker_task.cancel()
+        await asyncio.sleep(0)
+
+        with self.assertLogs("mem_mcp_server.server.mcp_server", "WARNING") as logs:
+            await MemMCPTools._drain_snap_queue()
+        self.assertEqual(self.recorded, [])
+        self.assertIn("1 snap job(s) not recorded", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()